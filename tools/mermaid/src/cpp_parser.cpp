@@ -46,6 +46,7 @@ std::string CppParser::extract_template_params_robust(const std::string& text) c
 FlowGraph CppParser::parse_file(const std::string& content, const std::string& filename) {
     blocks_.clear();
     connections_.clear();
+    connection_keys_.clear();
     flowgraph_name_.clear();
     source_code_ = content.c_str();
 
@@ -337,17 +338,8 @@ void CppParser::extract_single_blockrunner(TSNode node, const std::string&) {
         }
 
         // Avoid duplicates
-        bool duplicate = false;
-        for (const auto& c : connections_) {
-            if (c.source_block == conn.source_block &&
-                c.target_block == conn.target_block &&
-                c.target_channel == conn.target_channel &&
-                c.channel_index == conn.channel_index) {
-                duplicate = true;
-                break;
-            }
-        }
-        if (!duplicate) {
+        if (connection_keys_.emplace(conn.source_block, conn.target_block,
+                                     conn.target_channel, conn.channel_index).second) {
             connections_.push_back(conn);
         }
     }
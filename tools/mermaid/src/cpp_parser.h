@@ -3,6 +3,8 @@
 #include "flowgraph.h"
 #include <tree_sitter/api.h>
 #include <memory>
+#include <set>
+#include <tuple>
 
 namespace cler {
 
@@ -66,6 +68,8 @@ private:
     const char* source_code_;
     std::map<std::string, Block> blocks_;
     std::vector<Connection> connections_;
+    // (source, target, target channel, channel index) of every recorded connection
+    std::set<std::tuple<std::string, std::string, std::string, int>> connection_keys_;
     std::string flowgraph_name_;
 };
 
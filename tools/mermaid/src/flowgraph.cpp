@@ -1,5 +1,6 @@
 #include "flowgraph.h"
 #include <algorithm>
+#include <set>
 
 namespace cler {
 
@@ -15,7 +16,8 @@ bool FlowGraph::validate() {
     warnings.clear();
     error_message.clear();
 
-    // Check for dangling connections
+    // Check for dangling connections, collecting connected blocks in the same pass
+    std::set<std::string> connected;
     for (const auto& conn : connections) {
         if (blocks.find(conn.source_block) == blocks.end()) {
             error_message = "Unknown source block: " + conn.source_block;
@@ -27,21 +29,14 @@ bool FlowGraph::validate() {
             is_valid = false;
             return false;
         }
+        connected.insert(conn.source_block);
+        connected.insert(conn.target_block);
     }
 
     // Check for isolated blocks (warning only)
     for (const auto& [name, block] : blocks) {
-        if (block.in_flowgraph) {
-            bool has_connections = false;
-            for (const auto& conn : connections) {
-                if (conn.source_block == name || conn.target_block == name) {
-                    has_connections = true;
-                    break;
-                }
-            }
-            if (!has_connections) {
-                warnings.push_back("Isolated block: " + name);
-            }
+        if (block.in_flowgraph && connected.find(name) == connected.end()) {
+            warnings.push_back("Isolated block: " + name);
         }
     }
 
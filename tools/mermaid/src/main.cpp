@@ -2,8 +2,17 @@
 #include "mermaid_renderer.h"
 #include <iostream>
 #include <fstream>
+#include <filesystem>
+#include <map>
+#include <mutex>
+#include <set>
 #include <sstream>
+#include <system_error>
 #include <vector>
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <thread>
 
 struct ParseStats {
     int files_scanned = 0;
@@ -26,6 +35,8 @@ void print_usage(const char* prog_name) {
     std::cerr << "\nOptions:\n";
     std::cerr << "  -o <path>     Output file path (without .md extension)\n";
     std::cerr << "                Default: <input_filename>_flowgraph.md\n";
+    std::cerr << "  -j <N>        Number of files to process in parallel\n";
+    std::cerr << "                Default: number of hardware threads\n";
     std::cerr << "  -v, --verbose Show detailed parsing information\n";
     std::cerr << "  -h, --help    Show this help message\n";
     std::cerr << "\nExample:\n";
@@ -34,15 +45,132 @@ void print_usage(const char* prog_name) {
 }
 
 std::string read_file(const std::string& filepath) {
-    std::ifstream file(filepath);
+    std::ifstream file(filepath, std::ios::binary);
     if (!file.is_open()) {
         throw std::runtime_error("Cannot open file: " + filepath);
     }
+
+    // Regular files: size the buffer up front and read it in one call
+    std::error_code ec;
+    if (std::filesystem::is_regular_file(filepath, ec)) {
+        std::uintmax_t size = std::filesystem::file_size(filepath, ec);
+        if (!ec) {
+            std::string content(static_cast<size_t>(size), '\0');
+            if (!file.read(content.data(), content.size())) {
+                throw std::runtime_error("Cannot read file: " + filepath);
+            }
+            return content;
+        }
+    }
+
+    // Pipes, FIFOs and directories: stream whatever is readable instead
     std::stringstream buffer;
     buffer << file.rdbuf();
     return buffer.str();
 }
 
+// Outcome of processing one input file, reported in input order
+struct FileResult {
+    enum class Status { Succeeded, Skipped, Failed };
+
+    Status status = Status::Failed;
+    std::string out;  // Text for stdout
+    std::string err;  // Text for stderr
+    size_t blocks = 0;
+    size_t connections = 0;
+    size_t warnings = 0;
+};
+
+std::string default_output_path(const std::string& input_file) {
+    size_t last_slash = input_file.find_last_of("/\\");
+    size_t last_dot = input_file.find_last_of('.');
+    std::string base_name;
+
+    if (last_slash != std::string::npos) {
+        base_name = input_file.substr(last_slash + 1);
+    } else {
+        base_name = input_file;
+    }
+
+    if (last_dot != std::string::npos && last_dot > last_slash) {
+        base_name = base_name.substr(0, last_dot - (last_slash == std::string::npos ? 0 : last_slash + 1));
+    }
+
+    return base_name + "_flowgraph";
+}
+
+FileResult process_file(const std::string& input_file,
+                        const std::string& out_path,
+                        bool verbose,
+                        cler::CppParser& parser,
+                        cler::MermaidRenderer& renderer) {
+    FileResult result;
+    std::ostringstream out;
+    std::ostringstream err;
+
+    try {
+        // Read input file
+        std::string content = read_file(input_file);
+
+        // Fast pre-screen
+        if (!cler::CppParser::is_flowgraph_file(content)) {
+            if (verbose) {
+                out << "⊘ " << input_file << " (no flowgraph detected)\n";
+            }
+            result.status = FileResult::Status::Skipped;
+            result.out = out.str();
+            return result;
+        }
+
+        // Parse C++ file
+        cler::FlowGraph flowgraph = parser.parse_file(content, input_file);
+
+        if (!flowgraph.is_valid) {
+            err << "✗ " << input_file << ": " << flowgraph.error_message << "\n";
+            result.err = err.str();
+            return result;
+        }
+
+        // Check for blocks
+        if (flowgraph.blocks.empty()) {
+            err << "⚠ " << input_file << ": No blocks found\n";
+            result.err = err.str();
+            return result;
+        }
+
+        // Render to Mermaid
+        renderer.render_to_file(flowgraph, out_path);
+
+        // Report success
+        if (verbose) {
+            out << "✓ " << input_file << "\n";
+            out << "  Blocks: " << flowgraph.blocks.size()
+                << ", Connections: " << flowgraph.connections.size() << "\n";
+            if (!flowgraph.warnings.empty()) {
+                out << "  Warnings: " << flowgraph.warnings.size() << "\n";
+                for (const auto& warning : flowgraph.warnings) {
+                    out << "    - " << warning << "\n";
+                }
+            }
+            out << "  Output: " << out_path << ".md\n";
+        } else {
+            out << "Generated: " << out_path << ".md\n";
+        }
+
+        result.status = FileResult::Status::Succeeded;
+        result.blocks = flowgraph.blocks.size();
+        result.connections = flowgraph.connections.size();
+        result.warnings = flowgraph.warnings.size();
+
+    } catch (const std::exception& e) {
+        err << "✗ " << input_file << " (exception): " << e.what() << "\n";
+    }
+
+    result.out = out.str();
+    result.err = err.str();
+    return result;
+}
+
 int main(int argc, char* argv[]) {
     if (argc < 2) {
         print_usage(argv[0]);
@@ -50,21 +178,44 @@ int main(int argc, char* argv[]) {
     }
 
     std::vector<std::string> input_files;
+    std::set<std::string> seen_files;
     std::string output_path;
     bool verbose = false;
+    unsigned jobs = std::max(1u, std::thread::hardware_concurrency());
 
     // Parse arguments
     for (int i = 1; i < argc; i++) {
         std::string arg = argv[i];
         if (arg == "-o" && i + 1 < argc) {
             output_path = argv[++i];
+        } else if (arg == "-j" && i + 1 < argc) {
+            std::string value = argv[++i];
+            size_t pos = 0;
+            int count = 0;
+            try {
+                count = std::stoi(value, &pos);
+            } catch (...) {
+                pos = 0;
+            }
+            // Reject trailing garbage ("4abc") and non-positive counts
+            if (pos == 0 || pos != value.size() || count < 1) {
+                std::cerr << "Error: Invalid job count '" << value << "'\n\n";
+                print_usage(argv[0]);
+                return 1;
+            }
+            jobs = static_cast<unsigned>(count);
         } else if (arg == "-v" || arg == "--verbose") {
             verbose = true;
         } else if (arg == "-h" || arg == "--help") {
             print_usage(argv[0]);
             return 0;
         } else if (arg[0] != '-') {
-            input_files.push_back(arg);
+            // Skip repeated paths (e.g. overlapping globs) so each file is parsed once
+            std::error_code ec;
+            std::string key = std::filesystem::weakly_canonical(arg, ec).string();
+            if (seen_files.insert(ec ? arg : key).second) {
+                input_files.push_back(arg);
+            }
         } else {
             std::cerr << "Error: Unknown argument '" << arg << "'\n\n";
             print_usage(argv[0]);
@@ -83,93 +234,95 @@ int main(int argc, char* argv[]) {
         return 1;
     }
 
-    ParseStats stats;
-    cler::CppParser parser;
-    cler::MermaidRenderer renderer;
-
-    // Process each file with error recovery
-    for (const auto& input_file : input_files) {
-        stats.files_scanned++;
-
-        try {
-            // Read input file
-            std::string content = read_file(input_file);
-
-            // Fast pre-screen
-            if (!cler::CppParser::is_flowgraph_file(content)) {
-                if (verbose) {
-                    std::cout << "⊘ " << input_file << " (no flowgraph detected)\n";
-                }
-                stats.files_skipped++;
-                continue;
-            }
-
-            // Parse C++ file
-            cler::FlowGraph flowgraph = parser.parse_file(content, input_file);
+    // Resolve each input's output path and group inputs that share one, e.g.
+    // a/flowgraph.cpp and b/flowgraph.cpp both map to flowgraph_flowgraph.md.
+    // A group is handled by a single worker in command-line order, so the
+    // last input still wins and no two threads ever write the same file.
+    std::vector<std::string> out_paths;
+    std::vector<std::vector<size_t>> groups;
+    std::map<std::string, size_t> group_by_path;
+    out_paths.reserve(input_files.size());
+    for (size_t i = 0; i < input_files.size(); i++) {
+        out_paths.push_back(output_path.empty() ? default_output_path(input_files[i]) : output_path);
 
-            if (!flowgraph.is_valid) {
-                std::cerr << "✗ " << input_file << ": " << flowgraph.error_message << "\n";
-                stats.files_failed++;
-                continue;
-            }
+        std::error_code ec;
+        std::string key = std::filesystem::weakly_canonical(out_paths[i] + ".md", ec).string();
+        auto [it, inserted] = group_by_path.try_emplace(ec ? out_paths[i] + ".md" : key, groups.size());
+        if (inserted) {
+            groups.emplace_back();
+        }
+        groups[it->second].push_back(i);
+    }
 
-            // Check for blocks
-            if (flowgraph.blocks.empty()) {
-                std::cerr << "⚠ " << input_file << ": No blocks found\n";
-                stats.files_failed++;
-                continue;
-            }
+    // Process groups in parallel; each worker owns its parser and renderer
+    // since neither is thread-safe. Results are reported in command-line
+    // order, each one as soon as every earlier input has finished.
+    ParseStats stats;
+    std::vector<FileResult> results(input_files.size());
+    std::vector<bool> finished(input_files.size(), false);
+    size_t next_to_report = 0;
+    std::mutex report_mutex;
+    std::atomic<size_t> next_group{0};
 
-            // Determine output path
-            std::string out_path = output_path;
-            if (out_path.empty()) {
-                size_t last_slash = input_file.find_last_of("/\\");
-                size_t last_dot = input_file.find_last_of('.');
-                std::string base_name;
-
-                if (last_slash != std::string::npos) {
-                    base_name = input_file.substr(last_slash + 1);
-                } else {
-                    base_name = input_file;
-                }
+    auto report = [&](size_t index, FileResult result) {
+        std::lock_guard<std::mutex> lock(report_mutex);
+        results[index] = std::move(result);
+        finished[index] = true;
 
-                if (last_dot != std::string::npos && last_dot > last_slash) {
-                    base_name = base_name.substr(0, last_dot - (last_slash == std::string::npos ? 0 : last_slash + 1));
-                }
+        while (next_to_report < results.size() && finished[next_to_report]) {
+            FileResult& ready = results[next_to_report++];
+            stats.files_scanned++;
+            std::cout << ready.out;
+            std::cerr << ready.err;
 
-                out_path = base_name + "_flowgraph";
+            switch (ready.status) {
+                case FileResult::Status::Succeeded:
+                    stats.files_succeeded++;
+                    stats.blocks_found += ready.blocks;
+                    stats.connections_found += ready.connections;
+                    stats.warnings_total += ready.warnings;
+                    break;
+                case FileResult::Status::Skipped:
+                    stats.files_skipped++;
+                    break;
+                case FileResult::Status::Failed:
+                    stats.files_failed++;
+                    break;
             }
+            ready = FileResult{};  // Release the reported text
+        }
+    };
 
-            // Render to Mermaid
-            renderer.render_to_file(flowgraph, out_path);
-
-            // Report success
-            if (verbose) {
-                std::cout << "✓ " << input_file << "\n";
-                std::cout << "  Blocks: " << flowgraph.blocks.size()
-                         << ", Connections: " << flowgraph.connections.size() << "\n";
-                if (!flowgraph.warnings.empty()) {
-                    std::cout << "  Warnings: " << flowgraph.warnings.size() << "\n";
-                    for (const auto& warning : flowgraph.warnings) {
-                        std::cout << "    - " << warning << "\n";
-                    }
-                }
-                std::cout << "  Output: " << out_path << ".md\n";
-            } else {
-                std::cout << "Generated: " << out_path << ".md\n";
+    auto worker = [&]() {
+        cler::CppParser parser;
+        cler::MermaidRenderer renderer;
+        for (size_t g = next_group++; g < groups.size(); g = next_group++) {
+            for (size_t i : groups[g]) {
+                report(i, process_file(input_files[i], out_paths[i], verbose, parser, renderer));
             }
+        }
+    };
 
-            stats.files_succeeded++;
-            stats.blocks_found += flowgraph.blocks.size();
-            stats.connections_found += flowgraph.connections.size();
-            stats.warnings_total += flowgraph.warnings.size();
-
-        } catch (const std::exception& e) {
-            std::cerr << "✗ " << input_file << " (exception): " << e.what() << "\n";
-            stats.files_failed++;
-            // Continue with next file
+    // The main thread is one of the workers, so if thread creation fails
+    // the threads already started (or the main thread alone) finish the work
+    size_t num_workers = std::min<size_t>(jobs, groups.size());
+    std::vector<std::thread> workers;
+    workers.reserve(num_workers > 0 ? num_workers - 1 : 0);
+    try {
+        for (size_t i = 1; i < num_workers; i++) {
+            workers.emplace_back(worker);
+        }
+    } catch (const std::system_error& e) {
+        if (verbose) {
+            std::lock_guard<std::mutex> lock(report_mutex);
+            std::cerr << "Warning: started " << workers.size() + 1 << " of "
+                      << num_workers << " workers: " << e.what() << "\n";
         }
     }
+    worker();
+    for (auto& t : workers) {
+        t.join();
+    }
 
     // Print statistics if verbose or multiple files
     if (verbose || input_files.size() > 1) {
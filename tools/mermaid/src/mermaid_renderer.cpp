@@ -2,145 +2,223 @@
 #include <fstream>
 #include <sstream>
 #include <algorithm>
+#include <string_view>
 
 namespace cler {
 
+namespace {
+
+// Per-byte HTML entity; nullptr means the byte is copied as-is
+struct EscapeTable {
+    const char* entity[256] = {};
+    constexpr EscapeTable() {
+        entity[static_cast<unsigned char>('<')] = "&lt;";
+        entity[static_cast<unsigned char>('>')] = "&gt;";
+        entity[static_cast<unsigned char>('&')] = "&amp;";
+        entity[static_cast<unsigned char>('"')] = "&quot;";
+        entity[static_cast<unsigned char>('\'')] = "&apos;";
+    }
+};
+
+// Per-byte flag for characters allowed verbatim in a Mermaid node ID
+struct IdCharTable {
+    bool valid[256] = {};
+    constexpr IdCharTable() {
+        for (int c = '0'; c <= '9'; ++c) valid[c] = true;
+        for (int c = 'A'; c <= 'Z'; ++c) valid[c] = true;
+        for (int c = 'a'; c <= 'z'; ++c) valid[c] = true;
+    }
+};
+
+// Fills a caller-supplied buffer and only opens the destination file once the
+// buffer is full or the stream is flushed. Small documents are generated
+// before the file is touched and then written in one call; large ones still
+// stream to disk in buffer-sized chunks.
+class DeferredFileBuf : public std::streambuf {
+public:
+    DeferredFileBuf(const std::string& path, char* buffer, size_t size)
+        : path_(path) {
+        setp(buffer, buffer + size);
+    }
+
+protected:
+    int_type overflow(int_type ch) override {
+        if (!flush_buffer()) return traits_type::eof();
+        if (!traits_type::eq_int_type(ch, traits_type::eof())) {
+            *pptr() = traits_type::to_char_type(ch);
+            pbump(1);
+        }
+        return traits_type::not_eof(ch);
+    }
+
+    int sync() override {
+        return flush_buffer() ? 0 : -1;
+    }
+
+private:
+    bool flush_buffer() {
+        if (!file_.is_open()) {
+            // Unbuffered, since chunks arrive already batched. Binary mode
+            // skips newline translation; the output is plain LF markdown.
+            file_.rdbuf()->pubsetbuf(nullptr, 0);
+            file_.open(path_, std::ios::binary);
+            if (!file_) return false;
+        }
+        file_.write(pbase(), pptr() - pbase());
+        setp(pbase(), epptr());
+        return static_cast<bool>(file_.flush());
+    }
+
+    std::string path_;
+    std::ofstream file_;
+};
+
+constexpr EscapeTable kEscapeTable;
+constexpr IdCharTable kIdCharTable;
+
+// Style classes referenced by the ':::class' suffix on each node
+constexpr std::string_view kClassDefs =
+    "    classDef source fill:#e1f5fe\n"
+    "    classDef sink fill:#f3e5f5\n"
+    "    classDef processing fill:#e8f5e8\n";
+
+} // namespace
+
 MermaidRenderer::MermaidRenderer(const std::string& direction,
-                                 const std::string& fence_style)
-    : direction_(direction), fence_style_(fence_style) {}
+                                 const std::string& fence_style) {
+    // The fences and flowchart header only depend on the options, so build them once
+    if (fence_style == "backticks") {
+        header_ = "```mermaid\n";
+        footer_ = "```\n";
+    } else if (fence_style == "colons") {
+        header_ = "::: mermaid\n";
+        footer_ = ":::\n";
+    }
+    header_ += "flowchart " + direction + "\n";
+}
 
 std::string MermaidRenderer::render(const FlowGraph& flowgraph) {
-    return generate_mermaid(flowgraph);
+    std::ostringstream ss;
+    generate_mermaid(flowgraph, ss);
+    return ss.str();
 }
 
 void MermaidRenderer::render_to_file(const FlowGraph& flowgraph,
                                      const std::string& output_path) {
-    std::string content = generate_mermaid(flowgraph);
-    std::ofstream file(output_path + ".md");
-    file << content;
-}
-
-std::string MermaidRenderer::generate_mermaid(const FlowGraph& flowgraph) {
-    std::ostringstream ss;
-
-    // Opening fence
-    if (fence_style_ == "backticks") {
-        ss << "```mermaid\n";
-    } else if (fence_style_ == "colons") {
-        ss << "::: mermaid\n";
+    // Stream through a large buffer that is allocated once per renderer,
+    // uninitialized, and reused; the file is opened only when it fills or
+    // at the end, so typical documents need a single write
+    if (!write_buffer_) {
+        write_buffer_.reset(new char[kWriteBufferSize]);
     }
+    DeferredFileBuf buffer(output_path + ".md", write_buffer_.get(), kWriteBufferSize);
+    std::ostream file(&buffer);
+    generate_mermaid(flowgraph, file);
+    file.flush();
+}
 
-    ss << "flowchart " << direction_ << "\n";
+void MermaidRenderer::generate_mermaid(const FlowGraph& flowgraph, std::ostream& ss) {
+    // Opening fence and flowchart header
+    ss << header_;
 
-    // Add nodes
+    // Add nodes, tagging each with its style class in the same pass
     for (const auto& [block_name, block] : flowgraph.blocks) {
         if (!block.in_flowgraph) continue;
 
-        std::string node_id = get_node_id(block_name);
+        const std::string& node_id = get_node_id(block_name);
         std::string node_label = create_node_label(block);
-        auto [shape_start, shape_end] = get_node_shape(block);
+        const NodeStyle& style = get_node_style(block);
 
-        ss << "    " << node_id << shape_start << "\""
-           << node_label << "\"" << shape_end << "\n";
+        ss << "    " << node_id << style.shape_start << "\""
+           << node_label << "\"" << style.shape_end
+           << ":::" << style.style_class << "\n";
     }
 
     // Add edges
     for (const auto& conn : flowgraph.connections) {
-        std::string source_id = get_node_id(conn.source_block);
-        std::string target_id = get_node_id(conn.target_block);
+        const std::string& source_id = get_node_id(conn.source_block);
+        const std::string& target_id = get_node_id(conn.target_block);
         ss << "    " << source_id << " --> " << target_id << "\n";
     }
 
     // Add styling
-    ss << generate_styling(flowgraph);
+    ss << kClassDefs;
 
     // Closing fence
-    if (fence_style_ == "backticks") {
-        ss << "```\n";
-    } else if (fence_style_ == "colons") {
-        ss << ":::\n";
-    }
-
-    return ss.str();
+    ss << footer_;
 }
 
-std::string MermaidRenderer::get_node_id(const std::string& block_name) {
-    if (node_map_.find(block_name) == node_map_.end()) {
+const std::string& MermaidRenderer::get_node_id(const std::string& block_name) {
+    // Single lookup: reuse the insertion hint on a miss
+    auto it = node_map_.lower_bound(block_name);
+    if (it == node_map_.end() || it->first != block_name) {
         // Create valid Mermaid ID
-        std::string clean_name;
+        std::string node_id = "node_";
+        node_id.reserve(node_id.size() + block_name.size());
         for (char c : block_name) {
-            clean_name += std::isalnum(c) ? c : '_';
+            node_id += kIdCharTable.valid[static_cast<unsigned char>(c)] ? c : '_';
         }
-        node_map_[block_name] = "node_" + clean_name;
+        it = node_map_.emplace_hint(it, block_name, std::move(node_id));
     }
-    return node_map_[block_name];
+    return it->second;
 }
 
-std::string MermaidRenderer::html_escape(const std::string& text) {
-    std::string result;
-    result.reserve(text.size() * 1.2);  // Pre-allocate with some headroom
-
-    for (char c : text) {
-        switch (c) {
-            case '<': result += "&lt;"; break;
-            case '>': result += "&gt;"; break;
-            case '&': result += "&amp;"; break;
-            case '"': result += "&quot;"; break;
-            case '\'': result += "&apos;"; break;
-            default: result += c;
+void MermaidRenderer::html_escape(const std::string& text, std::string& out) {
+    // Fast path: most template parameters contain nothing to escape
+    size_t first = text.find_first_of("<>&\"'");
+    if (first == std::string::npos) {
+        out += text;
+        return;
+    }
+
+    out.append(text, 0, first);
+    for (char c : std::string_view(text).substr(first)) {
+        const char* entity = kEscapeTable.entity[static_cast<unsigned char>(c)];
+        if (entity) {
+            out += entity;
+        } else {
+            out += c;
         }
     }
-    return result;
 }
 
 std::string MermaidRenderer::create_node_label(const Block& block) const {
-    std::string label = block.name;
+    // Build the label in place to avoid intermediate temporaries
+    std::string label;
+    label.reserve(block.name.size() + block.type.size() +
+                  block.template_params.size() * 2 + 24);
+    label += block.name;
 
     // Add type (remove 'Block' suffix for cleaner display)
-    std::string clean_type = block.type;
-    size_t pos = clean_type.find("Block");
+    label += "<br/>(";
+    size_t pos = block.type.find("Block");
     if (pos != std::string::npos) {
-        clean_type.erase(pos, 5);
+        label.append(block.type, 0, pos);
+        label.append(block.type, pos + 5, std::string::npos);
+    } else {
+        label += block.type;
     }
-    label += "<br/>(" + clean_type + ")";
+    label += ')';
 
     // Show template parameters with safe HTML escaping
     if (!block.template_params.empty()) {
-        std::string escaped = html_escape(block.template_params);
-        label += "<br/>&lt;" + escaped + "&gt;";
+        label += "<br/>&lt;";
+        html_escape(block.template_params, label);
+        label += "&gt;";
     }
 
     return label;
 }
 
-std::pair<std::string, std::string> MermaidRenderer::get_node_shape(const Block& block) const {
-    if (block.is_source()) {
-        return {"([", "])"};  // Stadium shape
-    } else if (block.is_sink()) {
-        return {"[/", "/]"};  // Trapezoid
-    } else {
-        return {"[", "]"};    // Rectangle
-    }
-}
-
-std::string MermaidRenderer::generate_styling(const FlowGraph& flowgraph) {
-    std::ostringstream ss;
-
-    for (const auto& [block_name, block] : flowgraph.blocks) {
-        if (!block.in_flowgraph) continue;
-
-        std::string node_id = get_node_id(block_name);
-
-        if (block.is_source()) {
-            ss << "    style " << node_id << " fill:#e1f5fe\n";
-        } else if (block.is_sink()) {
-            ss << "    style " << node_id << " fill:#f3e5f5\n";
-        } else {
-            ss << "    style " << node_id << " fill:#e8f5e8\n";
-        }
-    }
-
-    return ss.str();
+const MermaidRenderer::NodeStyle& MermaidRenderer::get_node_style(const Block& block) {
+    // Indexed by (no inputs) | (no outputs) << 1, matching is_source()/is_sink()
+    static constexpr NodeStyle styles[] = {
+        {"[", "]", "processing"},   // Rectangle
+        {"([", "])", "source"},     // Stadium shape
+        {"[/", "/]", "sink"},       // Trapezoid
+        {"[", "]", "processing"},   // Rectangle (unconnected)
+    };
+    return styles[block.inputs.empty() | (block.outputs.empty() << 1)];
 }
 
 } // namespace cler
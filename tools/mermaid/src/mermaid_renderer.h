@@ -3,6 +3,8 @@
 #include "flowgraph.h"
 #include <string>
 #include <map>
+#include <memory>
+#include <ostream>
 
 namespace cler {
 
@@ -15,18 +17,28 @@ public:
     void render_to_file(const FlowGraph& flowgraph, const std::string& output_path);
 
 private:
-    std::string generate_mermaid(const FlowGraph& flowgraph);
-    std::string get_node_id(const std::string& block_name);
+    // Node shape delimiters and style class, derived from one classification
+    struct NodeStyle {
+        const char* shape_start;
+        const char* shape_end;
+        const char* style_class;
+    };
+
+    void generate_mermaid(const FlowGraph& flowgraph, std::ostream& ss);
+    const std::string& get_node_id(const std::string& block_name);
     std::string create_node_label(const Block& block) const;
-    std::pair<std::string, std::string> get_node_shape(const Block& block) const;
-    std::string generate_styling(const FlowGraph& flowgraph);
+    static const NodeStyle& get_node_style(const Block& block);
 
-    // Safe HTML escaping
-    static std::string html_escape(const std::string& text);
+    // Safe HTML escaping, appended to out
+    static void html_escape(const std::string& text, std::string& out);
 
-    std::string direction_;
-    std::string fence_style_;
+    std::string header_;  // Opening fence + flowchart direction
+    std::string footer_;  // Closing fence
     std::map<std::string, std::string> node_map_;
+
+    // Output file buffer, reused across render_to_file calls
+    static constexpr size_t kWriteBufferSize = 1 << 20;
+    std::unique_ptr<char[]> write_buffer_;
 };
 
 } // namespace cler